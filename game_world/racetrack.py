@@ -1,11 +1,78 @@
-from copy import deepcopy
-from itertools import product
+from functools import lru_cache
 import pickle
+from typing import Iterable
+
 import pygame
 import numpy as np
 
 Point = tuple[int, int]
 
+_COLORS_BASIC = {
+    0: "#ffffff",
+    1: "#000000",
+    2: "#d20000",
+    3: "#de9f00",
+    4: "#00AE00",
+    5: "#0000cd",
+    6: "#8b008b",
+    7: "#739F9F",
+}
+
+
+@lru_cache(maxsize=None)
+def _wall_tile(tile_w: int, tile_h: int, color_id: int, border: int) -> pygame.Surface:
+    """Pre-filled wall tile, solid when border is 0, outlined otherwise."""
+    tile = pygame.Surface((tile_w, tile_h))
+    tile.fill("#ffffff")
+    pygame.draw.rect(tile, pygame.Color(_COLORS_BASIC[color_id]), tile.get_rect(), border)
+    return tile
+
+
+_COLOR_RGB = np.array(
+    [pygame.Color(c)[:3] for c in _COLORS_BASIC.values()], dtype=np.uint8
+)
+
+_STAR_RAW = None
+
+
+def _get_star(w: float, h: float) -> pygame.Surface:
+    """Load star.png once and reuse scaled copies across renders."""
+    global _STAR_RAW
+    if _STAR_RAW is None:
+        _STAR_RAW = pygame.image.load("star.png")
+    return _scaled_star(int(0.8 * w), int(0.8 * h))
+
+
+@lru_cache(maxsize=None)
+def _scaled_star(w_int: int, h_int: int) -> pygame.Surface:
+    star = pygame.transform.scale(_STAR_RAW, (w_int, h_int))
+    # convert_alpha needs an actual video mode, not just pygame.init().
+    return star.convert_alpha() if pygame.display.get_surface() is not None else star
+
+
+@lru_cache(maxsize=None)
+def _triangle_tile(w_int: int, h_int: int) -> pygame.Surface:
+    """Pre-rendered spawn triangle, drawn once per tile size."""
+    tile = pygame.Surface((w_int, w_int))
+    tile.fill("#ffffff")
+    pygame.draw.polygon(
+        tile, "#278B00", [(w_int / 2, 0), (w_int, h_int), (0, h_int)]
+    )
+    return tile
+
+
+@lru_cache(maxsize=None)
+def _button_tile(tile_w: int, tile_h: int, color_id: int) -> pygame.Surface:
+    """Pre-rendered button circle on a transparent tile."""
+    tile = pygame.Surface((tile_w, tile_h), pygame.SRCALPHA)
+    pygame.draw.circle(
+        tile,
+        pygame.Color(_COLORS_BASIC[color_id]),
+        (tile_w / 2, tile_h / 2),
+        0.4 * min(tile_w, tile_h),
+    )
+    return tile
+
 
 class RaceTrack:
 
@@ -21,72 +88,128 @@ class RaceTrack:
     ) -> None:
         if not (walls.shape == active.shape == buttons.shape):
             raise ValueError("All map layers must be same shape.")
-        self.walls = walls
-        self.active = active
-        self.buttons = buttons
-        self.colors = colors
+        self.walls = np.ascontiguousarray(walls, dtype=np.bool_)
+        self.active = np.ascontiguousarray(active, dtype=np.bool_)
+        self.buttons = np.ascontiguousarray(buttons, dtype=np.bool_)
+        self.colors = np.ascontiguousarray(colors, dtype=np.uint8)
         self.shape = walls.shape
-        colors_basic = {
-            0: "#ffffff",
-            1: "#000000",
-            2: "#d20000",
-            3: "#de9f00",
-            4: "#00AE00",
-            5: "#0000cd",
-            6: "#8b008b",
-            7: "#739F9F",
-        }
-        self.color_scheme = {i: pygame.Color(c) for i, c in colors_basic.items()}
+        self.color_scheme = {i: pygame.Color(c) for i, c in _COLORS_BASIC.items()}
+        # uint8 RGB rows indexed by color id, for the vectorized render.
+        self._color_rgb = _COLOR_RGB
         self.spawn = spawn
         self.target = target
+        self._traversable_mask = None
         self.surface = self.render(*screen_size)
         self.screen_size = screen_size
+        # Inverse cell sizes, so get_grid_coord is two multiplies with no
+        # surface queries. Recompute if the surface is ever resized.
+        self._inv_w = self.shape[1] / self.surface.get_width()
+        self._inv_h = self.shape[0] / self.surface.get_height()
 
     def __deepcopy__(self, memo) -> "RaceTrack":
+        # ndarray.copy() is much faster than generic deepcopy, and the
+        # tuples are immutable so they can be shared outright.
         return RaceTrack(
-            deepcopy(self.walls, memo),
-            deepcopy(self.active, memo),
-            deepcopy(self.buttons, memo),
-            deepcopy(self.colors, memo),
-            deepcopy(self.target, memo),
-            deepcopy(self.spawn, memo),
-            deepcopy(self.screen_size, memo),
+            self.walls.copy(),
+            self.active.copy(),
+            self.buttons.copy(),
+            self.colors.copy(),
+            self.target,
+            self.spawn,
+            self.screen_size,
         )
 
     def render(self, width: int, height: int) -> pygame.Surface:
         """Draw out the track in its current state"""
         surface = pygame.Surface((width, height))
-        surface.fill("#ffffff")
         rows, cols = self.shape
         w, h = width / cols, height / rows
-        star_img = pygame.image.load("star.png")
-        star_img = pygame.transform.scale(star_img, (0.8 * w, 0.8 * h))
-        triangle = pygame.Surface((0.8 * w, 0.8 * w))
-        triangle.fill("#ffffff")
-        pygame.draw.polygon(
-            triangle, "#278B00", [(0.4 * w, 0), (0.8 * w, 0.8 * h), (0, 0.8 * h)]
-        )
-        for row, col in product(range(rows), range(cols)):
-            x, y = col * w, row * h
-            active = self.active[row, col]
-            wall = self.walls[row, col]
-            color_type = self.colors[row, col]
-            button = self.buttons[row, col]
-            color = self.color_scheme[color_type]
-            if wall != 0:
-                pygame.draw.rect(
-                    surface, color, (x, y, w + 1, h + 1), 0 if active else int(0.2 * w)
+        xs = (np.arange(cols) * w).astype(int)
+        ys = (np.arange(rows) * h).astype(int)
+        tile_w, tile_h = int(w) + 1, int(h) + 1
+        outline = int(0.2 * w)
+        star_img = _get_star(w, h)
+        triangle = _triangle_tile(int(0.8 * w), int(0.8 * h))
+        # Classify every cell in one pass: 1 = inactive wall, 2 = active
+        # wall, 4 = button, 0 = empty.
+        kind = (
+            self.walls * (1 + self.active) + (self.buttons & ~self.walls) * 4
+        ).astype(np.uint8)
+        # Active walls are solid fills, so paint them (and the white
+        # background) as one pixel array instead of per-cell blits.
+        tile_colors = self._color_rgb[self.colors]
+        tile_colors[kind != 2] = (255, 255, 255)
+        col_rep = np.diff(np.append(xs, width))
+        row_rep = np.diff(np.append(ys, height))
+        pixels = np.repeat(np.repeat(tile_colors, row_rep, axis=0), col_rep, axis=1)
+        pygame.surfarray.blit_array(surface, pixels.swapaxes(0, 1))
+        outline_r, outline_c = np.divmod(np.flatnonzero(kind == 1), cols)
+        blit_sequence = [
+            (
+                _wall_tile(tile_w, tile_h, int(self.colors[r, c]), outline),
+                (xs[c], ys[r]),
+            )
+            for r, c in zip(outline_r, outline_c)
+        ]
+        btn_r, btn_c = np.divmod(np.flatnonzero(kind == 4), cols)
+        btn_colors = self.colors[btn_r, btn_c]
+        for color_id in np.unique(btn_colors):
+            tile = _button_tile(tile_w, tile_h, int(color_id))
+            sel = btn_colors == color_id
+            blit_sequence += [
+                (tile, (x, y)) for x, y in zip(xs[btn_c[sel]], ys[btn_r[sel]])
+            ]
+        surface.blits(blit_sequence, doreturn=0)
+        tr, tc = self.target
+        if not (self.walls[tr, tc] or self.buttons[tr, tc]):
+            surface.blit(star_img, (xs[tc] + 0.1 * w, ys[tr] + 0.1 * h))
+        sr, sc = self.spawn
+        surface.blit(triangle, (xs[sc] + 0.1 * w, ys[sr] + 0.1 * h))
+        for x in (*xs, width - 2):
+            pygame.draw.line(surface, "#000000", (x, 0), (x, height), 2)
+        for y in (*ys, height - 2):
+            pygame.draw.line(surface, "#000000", (0, y), (width, y), 2)
+        return surface
+
+    def _render_cells(self, cells: Iterable[Point]) -> None:
+        """Repaint only the given (row, col) cells onto the existing surface."""
+        rows, cols = self.shape
+        width, height = self.surface.get_size()
+        w, h = width / cols, height / rows
+        tile_w, tile_h = int(w) + 1, int(h) + 1
+        outline = int(0.2 * w)
+        for r, c in cells:
+            x, y = int(c * w), int(r * h)
+            pygame.draw.rect(self.surface, "#ffffff", (x, y, tile_w, tile_h))
+            if self.walls[r, c]:
+                self.surface.blit(
+                    _wall_tile(
+                        tile_w,
+                        tile_h,
+                        int(self.colors[r, c]),
+                        0 if self.active[r, c] else outline,
+                    ),
+                    (x, y),
                 )
-            elif button:
-                pygame.draw.circle(
-                    surface, color, (x + w / 2, y + h / 2), 0.4 * min(w, h)
+            elif self.buttons[r, c]:
+                self.surface.blit(
+                    _button_tile(tile_w, tile_h, int(self.colors[r, c])), (x, y)
                 )
-            elif (row, col) == self.target:
-                surface.blit(star_img, (x + 0.1 * w, y + 0.1 * h))
-            if (row, col) == self.spawn:
-                surface.blit(triangle, (x + 0.1 * w, y + 0.1 * h))
-            pygame.draw.rect(surface, "#000000", (x, y, w + 1, h + 1), 2)
-        return surface
+            elif (r, c) == self.target:
+                self.surface.blit(_get_star(w, h), (x + 0.1 * w, y + 0.1 * h))
+            if (r, c) == self.spawn:
+                self.surface.blit(
+                    _triangle_tile(int(0.8 * w), int(0.8 * h)),
+                    (x + 0.1 * w, y + 0.1 * h),
+                )
+            # Redraw the graticule segments crossing this cell exactly
+            # where render puts the full-length lines.
+            x2 = int((c + 1) * w) if c + 1 < cols else width - 2
+            y2 = int((r + 1) * h) if r + 1 < rows else height - 2
+            for xv in (x, x2):
+                pygame.draw.line(self.surface, "#000000", (xv, y), (xv, y + tile_h), 2)
+            for yv in (y, y2):
+                pygame.draw.line(self.surface, "#000000", (x, yv), (x + tile_w, yv), 2)
 
     def find_wall_locations_np(
         self, color: int | None = None, active: bool | None = None
@@ -101,13 +224,12 @@ class RaceTrack:
         Returns:
             tuple[np.ndarray, np.ndarray]: A tuple containing an array of all the row numbers and an array of all the column numbers
         """
-        color_mask = (
-            (self.colors == color) if color is not None else np.ones(self.shape)
-        ).astype(int)
-        active_mask = (
-            (self.active == active) if active is not None else np.ones(self.shape)
-        ).astype(int)
-        output = np.where(self.walls.astype(int) & color_mask & active_mask)
+        mask = self.walls.copy()
+        if color is not None:
+            mask &= self.colors == color
+        if active is not None:
+            mask &= self.active == active
+        output = np.nonzero(mask)
         assert len(output) == 2
         return output
 
@@ -125,7 +247,25 @@ class RaceTrack:
             set[Point]: A set containing the coordinates (row, col) of walls with the criteria given.
         """
         rows, cols = self.find_wall_locations_np(color, active)
-        return set(zip(rows.astype(int), cols.astype(int)))
+        return set(zip(rows, cols))
+
+    def find_buttons_np(
+        self, color: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the locations of the buttons
+
+        Args:
+            color (int | None, optional): The color of button you want to find. Defaults to None.
+                Returns all buttons of any color if None
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: A tuple containing an array of all the row numbers and an array of all the column numbers
+        """
+        mask = self.buttons
+        if color is not None:
+            mask = mask & (self.colors == color)
+        return np.nonzero(mask)
 
     def find_buttons(self, color: int | None = None) -> set[Point]:
         """
@@ -138,11 +278,7 @@ class RaceTrack:
         Returns:
             set[Point]: A set containing the coordinates (row, col) of the buttons.
         """
-        color_mask = (
-            (self.colors == color) if color is not None else np.ones(self.shape)
-        ).astype(int)
-        rows, cols = np.where(self.buttons.astype(int) & color_mask)
-        return set(zip(rows.astype(int), cols.astype(int)))
+        return set(zip(*self.find_buttons_np(color)))
 
     def find_traversable_cells(self) -> set[Point]:
         """
@@ -152,23 +288,41 @@ class RaceTrack:
         Returns:
             set[Point]: The locations where you can currently walk.
         """
-        output = np.where((self.walls == 0).astype(int) | (1 - self.active).astype(int))
-        return set(zip(output[0].astype(int), output[1].astype(int)))
+        output = np.nonzero(self._get_traversable_mask())
+        return set(zip(output[0], output[1]))
 
-    def toggle(self, color: int) -> None:
-        self.active[self.find_wall_locations_np(color)] = (
-            1 - self.active[self.find_wall_locations_np(color)]
+    def _get_traversable_mask(self) -> np.ndarray:
+        if self._traversable_mask is None:
+            self._traversable_mask = (self.walls == 0) | (self.active == 0)
+        return self._traversable_mask
+
+    def is_traversable(self, row: int, col: int) -> bool:
+        """
+        Check whether your bot can currently exist at (row, col).
+        Buttons and deactivated walls count as traversable.
+
+        Args:
+            row (int): The row to check.
+            col (int): The column to check.
+
+        Returns:
+            bool: True if the cell is in bounds and not an active wall.
+        """
+        rows, cols = self.shape
+        return (
+            0 <= row < rows
+            and 0 <= col < cols
+            and bool(self._get_traversable_mask()[row, col])
         )
-        self.surface = self.render(self.surface.get_width(), self.surface.get_height())
+
+    def toggle(self, color: int) -> None:
+        idx = self.find_wall_locations_np(color)
+        self.active[idx] ^= True
+        self._traversable_mask = None
+        self._render_cells(zip(*idx))
 
     def get_grid_coord(self, x: float, y: float) -> tuple[int, int]:
-        screen_width, screen_height = (
-            self.surface.get_width(),
-            self.surface.get_height(),
-        )
-        rows, cols = self.shape
-        w, h = screen_width / cols, screen_height / rows
-        return int(y / h), int(x / w)
+        return int(y * self._inv_h), int(x * self._inv_w)
 
     def save(self, filename: str) -> None:
         save_data = (
@@ -181,7 +335,7 @@ class RaceTrack:
             self.screen_size,
         )
         with open(filename, "wb") as f:
-            pickle.dump(save_data, f)
+            pickle.dump(save_data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 def load_track(filename: str) -> RaceTrack:
@@ -195,10 +349,10 @@ def load_track(filename: str) -> RaceTrack:
 def blank_track(
     grid_size: tuple[int, int], screen_size: tuple[int, int], n_colors: int
 ) -> RaceTrack:
-    walls = np.zeros(grid_size)
-    buttons = np.zeros(grid_size)
-    active = np.ones(grid_size)
-    colors = np.zeros(grid_size)
+    walls = np.zeros(grid_size, dtype=np.bool_)
+    buttons = np.zeros(grid_size, dtype=np.bool_)
+    active = np.ones(grid_size, dtype=np.bool_)
+    colors = np.zeros(grid_size, dtype=np.uint8)
     return RaceTrack(
         walls,
         active,
@@ -1,5 +1,6 @@
 import sys
 
+import numpy as np
 import pygame
 import pygame.locals
 
@@ -44,6 +45,61 @@ def make_solid_colored_button(
     return Button(x, y, width, height, surface)
 
 
+def _apply_wall(
+    track: RaceTrack, r: int, c: int, color: int, shift_held: bool
+) -> None:
+    if color == 0:
+        track.walls[r, c] = 0
+    else:
+        track.walls[r, c] = 1
+        track.active[r, c] = 1 - int(shift_held)
+    track.colors[r, c] = color
+    track.buttons[r, c] = 0
+    track._traversable_mask = None
+
+
+def _apply_button(
+    track: RaceTrack, r: int, c: int, color: int, shift_held: bool
+) -> None:
+    track.buttons[r, c] = 0 if color == 0 else 1
+    track.walls[r, c] = 0
+    track.colors[r, c] = color
+    track.active[r, c] = 1
+    track._traversable_mask = None
+
+
+def _apply_target(
+    track: RaceTrack, r: int, c: int, color: int, shift_held: bool
+) -> None:
+    track.target = (r, c)
+    track.walls[r, c] = 0
+    track.buttons[r, c] = 0
+    track.colors[r, c] = 0
+    track.active[r, c] = 1
+    track._traversable_mask = None
+
+
+def _apply_spawn(
+    track: RaceTrack, r: int, c: int, color: int, shift_held: bool
+) -> None:
+    track.spawn = (r, c)
+    track.walls[r, c] = 0
+    track.buttons[r, c] = 0
+    track.colors[r, c] = 0
+    track.active[r, c] = 1
+    track._traversable_mask = None
+
+
+_KIND_APPLY = {
+    "wall": _apply_wall,
+    "button": _apply_button,
+    "target": _apply_target,
+    "spawn": _apply_spawn,
+}
+# target and spawn are single-point, so the brush collapses to its center cell.
+_SINGLE_CELL_KINDS = ("target", "spawn")
+
+
 def click_track(
     track: RaceTrack,
     selected_color: int,
@@ -52,51 +108,39 @@ def click_track(
     mx: int,
     my: int,
     cursor_size: int,
-    handled_points: set[tuple[int, int]],
+    handled_points: np.ndarray,
     shift_held: bool,
 ):
     if not pressed or not track.surface.get_rect().collidepoint(mx, my):
         return
     row, col = track.get_grid_coord(mx, my)
-    for r in range(row - cursor_size + 1, row + cursor_size):
-        for c in range(col - cursor_size + 1, col + cursor_size):
-            if (
-                r not in range(track.shape[0])
-                or c not in range(track.shape[1])
-                or (r, c) in handled_points
-            ):
-                continue
-            handled_points.add((r, c))
-            match selected_kind:
-                case "wall":
-                    if selected_color == 0:
-                        track.walls[r, c] = 0
-                    else:
-                        track.walls[r, c] = 1
-                        track.active[r, c] = 1 - int(shift_held)
-                    track.colors[r, c] = selected_color
-                    track.buttons[r, c] = 0
-                case "button":
-                    if selected_color == 0:
-                        track.buttons[r, c] = 0
-                    else:
-                        track.buttons[r, c] = 1
-                    track.walls[r, c] = 0
-                    track.colors[r, c] = selected_color
-                    track.active[r, c] = 1
-                case "target":
-                    track.target = (r, c)
-                    track.walls[r, c] = 0
-                    track.buttons[r, c] = 0
-                    track.colors[r, c] = 0
-                    track.active[r, c] = 1
-                case "spawn":
-                    track.spawn = (r, c)
-                    track.walls[r, c] = 0
-                    track.buttons[r, c] = 0
-                    track.colors[r, c] = 0
-                    track.active[r, c] = 1
-    track.surface = track.render(track.surface.get_width(), track.surface.get_height())
+    old_target, old_spawn = track.target, track.spawn
+    painted = []
+    apply_kind = _KIND_APPLY[selected_kind]
+    if selected_kind in _SINGLE_CELL_KINDS:
+        if not handled_points[row, col]:
+            handled_points[row, col] = True
+            painted.append((row, col))
+            apply_kind(track, row, col, selected_color, shift_held)
+    else:
+        r0 = max(0, row - cursor_size + 1)
+        r1 = min(track.shape[0], row + cursor_size)
+        c0 = max(0, col - cursor_size + 1)
+        c1 = min(track.shape[1], col + cursor_size)
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                if handled_points[r, c]:
+                    continue
+                handled_points[r, c] = True
+                painted.append((r, c))
+                apply_kind(track, r, c, selected_color, shift_held)
+    if not painted:
+        return
+    if track.target != old_target:
+        painted.append(old_target)
+    if track.spawn != old_spawn:
+        painted.append(old_spawn)
+    track._render_cells(painted)
 
 
 def main():
@@ -138,7 +182,7 @@ def main():
     shift_held = False
 
     cursor_size = 1
-    handled_points = set()
+    handled_points = np.zeros(track.shape, dtype=np.bool_)
 
     while True:
         screen.fill("#A6A6A6")
@@ -157,7 +201,7 @@ def main():
                         selected_kind = kind
             elif event.type == pygame.locals.MOUSEBUTTONUP:
                 pressed = False
-                handled_points.clear()
+                handled_points.fill(False)
             elif event.type == pygame.locals.KEYDOWN:
                 if event.key == pygame.K_UP:
                     cursor_size += 1
@@ -1,13 +1,36 @@
 import random
+
+import numpy as np
+from numba import njit
+
 from game_world.racetrack import RaceTrack
 
 
 Point = tuple[int, int]
 
 
+# Explicit signature so compilation happens at import (and persists via
+# cache=True) instead of hitching on the bot's first move.
+@njit("int8[:, :](boolean[:, :], boolean[:, :], int64, int64)", cache=True, fastmath=True)
+def _safe_offsets(
+    walls: np.ndarray, active: np.ndarray, r: int, c: int
+) -> np.ndarray:
+    """Return the (dr, dc) moves from (r, c) that stay in bounds and off active walls."""
+    rows, cols = walls.shape
+    drs = (-1, 1, 0, 0)
+    dcs = (0, 0, -1, 1)
+    out = np.empty((4, 2), dtype=np.int8)
+    n = 0
+    for i in range(4):
+        nr, nc = r + drs[i], c + dcs[i]
+        if 0 <= nr < rows and 0 <= nc < cols and (not walls[nr, nc] or not active[nr, nc]):
+            out[n, 0] = drs[i]
+            out[n, 1] = dcs[i]
+            n += 1
+    return out[:n]
+
+
 def random_move(loc: Point, track: RaceTrack) -> Point:
-    safe = track.find_traversable_cells()
-    options = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    neighbors = {opt: (loc[0] + opt[0], loc[1] + opt[1]) for opt in options}
-    safe_options = [opt for opt in neighbors if neighbors[opt] in safe]
-    return random.choice(safe_options)
+    safe_options = _safe_offsets(track.walls, track.active, loc[0], loc[1])
+    opt = safe_options[random.randrange(len(safe_options))]
+    return int(opt[0]), int(opt[1])